@@ -1,36 +1,80 @@
 """Defines tools to retrieve Kepler data from the archive at MAST."""
 from __future__ import division
 import os
-import glob
+import fnmatch
+import json
 import logging
 import re
+import threading
+import tempfile
 import warnings
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+
+import requests
 from requests import HTTPError
 
 import numpy as np
-from astropy.table import join, Table, Row
+from astropy.table import join, hstack, vstack, Table, Row
 from astropy.coordinates import SkyCoord
 from astropy.io import ascii
 from astropy import units as u
-from astropy.utils import deprecated
+from astropy.utils import deprecated, lazyproperty
 
 from .targetpixelfile import TargetPixelFile
 from .collections import TargetPixelFileCollection, LightCurveCollection
 from .utils import suppress_stdout, LightkurveWarning, LightkurveDeprecationWarning
 from .io import read
+from .version import __version__
 from . import PACKAGEDIR
 
 log = logging.getLogger(__name__)
 
 __all__ = ['search_targetpixelfile', 'search_lightcurve',
            'search_lightcurvefile', 'search_tesscut',
-           'SearchResult']
+           'clear_search_cache', 'SearchResult']
+
+# Maximum number of files we download from MAST in parallel.
+# MAST throttles clients which open too many simultaneous connections.
+MAX_TCP_CONNECTIONS = 5
+# TESSCut extracts cutouts on the fly, which is more expensive for the
+# server, so we use fewer simultaneous connections for this service.
+MAX_TESSCUT_CONNECTIONS = 3
+_tesscut_semaphore = threading.BoundedSemaphore(MAX_TESSCUT_CONNECTIONS)
+# Maximum number of observations whose products are requested from MAST at once
+PRODUCT_LIST_CHUNK_SIZE = 500
+# Endpoint of the TESSCut API which returns cutouts
+TESSCUT_URL = "https://mast.stsci.edu/tesscut/api/v0.1/astrocut"
+
+# Regular expressions used to parse target names and product descriptions
+_ID_RE = re.compile(r"^(kplr|kic|ktwo|epic|tess|tic) ?(\d+)$")  # Kepler, K2, or TESS target ID
+_KPLR_Q_RE = re.compile(r".*Q(\d+)")  # Kepler quarter in a description
+_KPLR_QEND_RE = re.compile(r"q(\d+)$")  # Kepler quarter at the end of a description
+
+# MAST `target_name` formats of the Kepler, K2, and TESS target IDs
+_ID_FORMATS = {'kplr': 'kplr{:09d}', 'kic': 'kplr{:09d}',
+               'ktwo': 'ktwo{:09d}', 'epic': 'ktwo{:09d}',
+               'tess': '{:09d}', 'tic': '{:09d}'}
 
 
 class SearchError(Exception):
     pass
 
 
+def _suppress_stdout_unless_debug(f):
+    """Decorator which suppresses the print outputs of a function, e.g. the
+    astroquery progress bars, unless the logger is set to DEBUG level."""
+    quiet_f = suppress_stdout(f)
+
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        if log.isEnabledFor(logging.DEBUG):
+            return f(*args, **kwargs)
+        return quiet_f(*args, **kwargs)
+    return wrapper
+
+
 class SearchResult(object):
     """Container for the results returned by `search_targetpixelfile`,
     `search_lightcurve`, or `search_tesscut`.
@@ -59,66 +103,92 @@ class SearchResult(object):
         These columns are not part of the MAST Portal API, but they make the
         display of search results much nicer in Lightkurve.
         """
-        self.table['#'] = None
-        for idx in range(len(self.table)):
-            self.table['#'][idx] = idx
+        self.table['#'] = np.arange(len(self.table), dtype=np.int64)
+
+    @lazyproperty
+    def _repr_table(self):
+        """Table containing the columns shown by `__repr__`, built only once."""
+        columns = ['#', 'observation', 'author', 'target_name', 'productFilename', 'distance']
+        return Table([self.table[col] for col in columns], copy=False)
 
     def __repr__(self, html=False):
         out = 'SearchResult containing {} data products.'.format(len(self.table))
         if len(self.table) == 0:
             return out
-        columns = ['#', 'observation', 'author', 'target_name', 'productFilename', 'distance']
-        return out + '\n\n' + '\n'.join(self.table[columns].pformat(max_width=300, html=html))
+        return out + '\n\n' + '\n'.join(self._repr_table.pformat(max_width=300, html=html))
 
     def _repr_html_(self):
         return self.__repr__(html=True)
 
     def __getitem__(self, key):
         """Implements indexing and slicing, e.g. SearchResult[2:5]."""
-        # this check is necessary due to an astropy bug
-        # for more information, see issue #445
-        if key == -1:
-            key = len(self.table) - 1
+        if isinstance(key, (int, np.integer)):
+            # Indexing a Table with an integer would return a `Row`, and
+            # converting a `Row` back into a `Table` is slow, so we take a
+            # one-row slice instead.  Negative indices are normalized first,
+            # which also avoids an astropy bug (see issue #445).
+            if key < 0:
+                key += len(self.table)
+            if not 0 <= key < len(self.table):
+                raise IndexError('index {} is out of bounds for a SearchResult '
+                                 'with {} products'.format(key, len(self.table)))
+            return SearchResult(table=self.table[key:key+1])
         selection = self.table[key]
-        # Indexing a Table with an integer will return a Row
         if isinstance(selection, Row):
             selection = Table(selection)
         return SearchResult(table=selection)
 
+    def __iter__(self):
+        """Iterates over the products, yielding one-row `SearchResult` objects."""
+        for idx in range(len(self.table)):
+            yield self[idx]
+
     def __len__(self):
         """Returns the number of products in the SearchResult table."""
         return len(self.table)
 
-    @property
+    # The properties below are cached because a `SearchResult` is not
+    # modified after it has been created.  The column-based properties return
+    # plain contiguous numpy arrays, regardless of whether the columns are masked.
+    @lazyproperty
     def unique_targets(self):
         """Returns a table of targets and their RA & dec values produced by search"""
         mask = ['target_name', 's_ra', 's_dec']
-        return Table.from_pandas(self.table[mask].to_pandas().drop_duplicates('target_name').reset_index(drop=True))
-
-    @property
+        # Keep the first occurrence of each target, in the original order.
+        # We index each column directly because projecting `self.table[mask]`
+        # first would copy the full columns before selecting the rows.
+        _, first_idx = np.unique(np.asarray(self.table['target_name']), return_index=True)
+        first_idx.sort()
+        return Table([self.table[col][first_idx] for col in mask], copy=False)
+
+    @lazyproperty
     def obsid(self):
         """Returns an array of MAST observation IDs"""
         return np.asarray(np.unique(self.table['obsid']), dtype='int64')
 
-    @property
+    @lazyproperty
     def target_name(self):
         """Returns an array of target names"""
-        return self.table['target_name'].data.data
+        return np.ascontiguousarray(self.table['target_name'])
 
-    @property
+    @lazyproperty
     def ra(self):
         """Returns an array of RA values for targets in search"""
-        return self.table['s_ra'].data.data
+        return np.ascontiguousarray(self.table['s_ra'])
 
-    @property
+    @lazyproperty
     def dec(self):
         """Returns an array of dec values for targets in search"""
-        return self.table['s_dec'].data.data
+        return np.ascontiguousarray(self.table['s_dec'])
 
-    def _download_one(self, table, quality_bitmask, download_dir, cutout_size, **kwargs):
+    def _download_one_row(self, row_idx, quality_bitmask, download_dir, cutout_size,
+                          is_cutout=None, **kwargs):
         """Private method used by `download()` and `download_all()` to download
         exactly one file from the MAST archive.
 
+        The file is identified by its integer index in `SearchResult.table`.
+        Callers which already know whether the row is a TESSCut entry can pass
+        `is_cutout` to skip the check of the description.
         Always returns a `TargetPixelFile` or `LightCurve` object.
         """
         # Make sure astroquery uses the same level of verbosity
@@ -127,18 +197,24 @@ class SearchResult(object):
         if download_dir is None:
             download_dir = self._default_download_dir()
 
+        if is_cutout is None:
+            is_cutout = 'FFI Cutout' in self.table['description'][row_idx]
+
         # if the SearchResult row is a TESScut entry, then download cutout
-        if 'FFI Cutout' in table[0]['description']:
+        if is_cutout:
+            # Access the columns directly to avoid creating a one-row `Table`
+            target_name = self.table['target_name'][row_idx]
+            sector = self.table['sequence_number'][row_idx]
             try:
                 log.debug("Started downloading TESSCut for '{}' sector {}."
-                          "".format(table[0]['target_name'], table[0]['sequence_number']))
-                path = self._fetch_tesscut_path(table[0]['target_name'],
-                                                table[0]['sequence_number'],
+                          "".format(target_name, sector))
+                path = self._fetch_tesscut_path(target_name,
+                                                sector,
                                                 download_dir,
                                                 cutout_size)
             except Exception as exc:
                 msg = str(exc)
-                if "504" in msg:
+                if "504" in msg or isinstance(exc, requests.exceptions.Timeout):
                     # TESSCut will occasionally return a "504 Gateway Timeout
                     # error" when it is overloaded.
                     raise HTTPError('The TESS FFI cutout service at MAST appears '
@@ -151,20 +227,48 @@ class SearchResult(object):
 
             return read(path,
                         quality_bitmask=quality_bitmask,
-                        targetid=table[0]['targetid'])
+                        targetid=self.table['targetid'][row_idx])
 
         else:
             if cutout_size is not None:
                 warnings.warn('`cutout_size` can only be specified for TESS '
                               'Full Frame Image cutouts.', LightkurveWarning)
-            from astroquery.mast import Observations
-            log.debug("Started downloading {}.".format(table[:1]['dataURL'][0]))
-            path = Observations.download_products(table[:1], mrp_only=False,
+            Observations, _, _ = _get_mast()
+            log.debug("Started downloading {}.".format(self.table['dataURL'][row_idx]))
+            # astroquery expects a `Table` of products
+            path = Observations.download_products(self.table[row_idx:row_idx+1],
+                                                  mrp_only=False,
                                                   download_dir=download_dir)['Local Path'][0]
             log.debug("Finished downloading.")
             return read(path, quality_bitmask=quality_bitmask, **kwargs)
 
-    @suppress_stdout
+    def _download_products(self, table, download_dir):
+        """Private method used by `download_all()` to download the archive
+        (i.e. non-TESSCut) products in `table` using a single astroquery call.
+
+        Returns a list of local paths, in the same order as the rows of `table`.
+        """
+        # Make sure astroquery uses the same level of verbosity
+        logging.getLogger('astropy').setLevel(log.getEffectiveLevel())
+
+        Observations, _, _ = _get_mast()
+        log.debug("Started downloading {} files.".format(len(table)))
+        manifest = Observations.download_products(table, mrp_only=False,
+                                                  download_dir=download_dir)
+        log.debug("Finished downloading.")
+        # astroquery removes duplicate products from the manifest, so we map
+        # the local paths back onto the rows of `table` using the file names.
+        local_paths = {os.path.basename(path): path for path in manifest['Local Path']}
+        return [local_paths[os.path.basename(fn)] for fn in table['productFilename']]
+
+    def _download_and_read_products(self, table, download_dir, quality_bitmask, **kwargs):
+        """Private method used by `download_all()` to download the archive
+        products in `table` and read them, in the same order as the rows.
+        """
+        paths = self._download_products(table, download_dir)
+        return [read(path, quality_bitmask=quality_bitmask, **kwargs) for path in paths]
+
+    @_suppress_stdout_unless_debug
     def download(self, quality_bitmask='default', download_dir=None, cutout_size=None, **kwargs):
         """Returns a single `LightCurve` or `TargetPixelFile` object.
 
@@ -220,14 +324,15 @@ class SearchResult(object):
                           'to limit your search.'.format(len(self.table)),
                           LightkurveWarning)
 
-        return self._download_one(table=self.table[:1],
-                                  quality_bitmask=quality_bitmask,
-                                  download_dir=download_dir,
-                                  cutout_size=cutout_size,
-                                  **kwargs)
+        return self._download_one_row(row_idx=0,
+                                      quality_bitmask=quality_bitmask,
+                                      download_dir=download_dir,
+                                      cutout_size=cutout_size,
+                                      **kwargs)
 
-    @suppress_stdout
-    def download_all(self, quality_bitmask='default', download_dir=None, cutout_size=None, **kwargs):
+    @_suppress_stdout_unless_debug
+    def download_all(self, quality_bitmask='default', download_dir=None, cutout_size=None,
+                     n_workers=MAX_TCP_CONNECTIONS, **kwargs):
         """Returns a `~lightkurve.collections.TargetPixelFileCollection` or
         `~lightkurve.collections.LightCurveCollection`.
 
@@ -253,6 +358,13 @@ class SearchResult(object):
         cutout_size : int, float or tuple
             Side length of cutout in pixels. Tuples should have dimensions (y, x).
             Default size is (5, 5)
+        n_workers : int
+            Number of threads used to download and read the files in parallel.
+            The archive products are split into `n_workers` groups, which are
+            downloaded at the same time, and each file is read as soon as its
+            group has been downloaded.  Values larger than `MAX_TCP_CONNECTIONS`
+            (5) are capped to avoid being throttled by MAST, and at most
+            `MAX_TESSCUT_CONNECTIONS` (3) cutouts are requested at the same time.
         kwargs : dict
             Extra keyword arguments passed on to the file format reader function.
 
@@ -275,14 +387,57 @@ class SearchResult(object):
                           LightkurveWarning)
             return None
         log.debug("{} files will be downloaded.".format(len(self.table)))
+        # Resolve the cache directory once, rather than in each worker thread
+        if download_dir is None:
+            download_dir = self._default_download_dir()
 
-        products = []
-        for idx in range(len(self.table)):
-            products.append(self._download_one(table=self.table[idx:idx+1],
+        # TESSCut cutouts are generated on demand and need to be requested one
+        # by one, whereas archive products can be downloaded in groups.
+        is_cutout = np.char.find(np.asarray(self.table['description'], dtype=str),
+                                 'FFI Cutout') >= 0
+        if cutout_size is not None and not is_cutout.all():
+            warnings.warn('`cutout_size` can only be specified for TESS '
+                          'Full Frame Image cutouts.', LightkurveWarning)
+
+        # Downloads are network-bound, so we use threads to overlap them,
+        # and the files are read inside the worker threads as well.
+        n_workers = max(1, min(n_workers, MAX_TCP_CONNECTIONS, len(self.table)))
+        futures = {}
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            # Resolve the coordinates and sectors of each cutout target once,
+            # so that the worker threads do not all query MAST for the same
+            # target at the same time.  Errors are raised by the workers.
+            for target in np.unique(np.asarray(self.table['target_name'])[is_cutout]):
+                try:
+                    _resolve_tesscut_target(target)
+                except Exception:
+                    pass
+            for idx in np.where(is_cutout)[0]:
+                futures[idx] = executor.submit(self._download_one_row,
+                                               row_idx=idx,
                                                quality_bitmask=quality_bitmask,
                                                download_dir=download_dir,
                                                cutout_size=cutout_size,
-                                               **kwargs))
+                                               is_cutout=True,
+                                               **kwargs)
+            # astroquery downloads the files of a request one at a time, so the
+            # archive products are split into one group per worker.  Each group
+            # is read as soon as it has been downloaded, while the other groups
+            # are still being downloaded.
+            archive_idx = np.where(~is_cutout)[0]
+            group_futures = []
+            if len(archive_idx) > 0:
+                for group in np.array_split(archive_idx, min(n_workers, len(archive_idx))):
+                    group_futures.append((group, executor.submit(self._download_and_read_products,
+                                                                 self.table[group],
+                                                                 download_dir=download_dir,
+                                                                 quality_bitmask=quality_bitmask,
+                                                                 **kwargs)))
+            # Collect the products in the same order as the rows of the table
+            products = {idx: future.result() for idx, future in futures.items()}
+            for group, future in group_futures:
+                products.update(zip(group, future.result()))
+            products = [products[idx] for idx in range(len(self.table))]
         if isinstance(products[0], TargetPixelFile):
             return TargetPixelFileCollection(products)
         else:
@@ -333,8 +488,7 @@ class SearchResult(object):
         path : str
             Path to locally downloaded cutout file
         """
-        from astroquery.mast import TesscutClass
-        coords = _resolve_object(target)
+        TesscutClass = _get_tesscut_class()
 
         # Set cutout_size defaults
         if cutout_size is None:
@@ -345,18 +499,22 @@ class SearchResult(object):
         if not os.path.isdir(tesscut_dir):
             # if it doesn't exist, make a new cache directory
             try:
-                os.mkdir(tesscut_dir)
+                # `exist_ok` avoids a race when cutouts are downloaded in parallel
+                os.makedirs(tesscut_dir, exist_ok=True)
             # downloads into default cache if OSError occurs
             except OSError:
                 tesscut_dir = download_dir
 
         # Resolve SkyCoord of given target
-        coords = _resolve_object(target)
+        coords, sec = _resolve_tesscut_target(target)
 
         # build path string name and check if it exists
         # this is necessary to ensure cutouts are not downloaded multiple times
-        sec = TesscutClass().get_sectors(coords)
-        sector_name = sec[sec['sector'] == sector]['sectorName'][0]
+        sector_row = sec.loc[sector]
+        if isinstance(sector_row, Table):
+            # A target may fall on more than one camera or CCD in a sector
+            sector_row = sector_row[0]
+        sector_name = sector_row['sectorName']
         if isinstance(cutout_size, int):
             size_str = str(int(cutout_size)) + 'x' + str(int(cutout_size))
         elif isinstance(cutout_size, tuple) or isinstance(cutout_size, list):
@@ -364,23 +522,43 @@ class SearchResult(object):
 
         # search cache for file with matching ra, dec, and cutout size
         # ra and dec are searched within 0.001 degrees of input target
-        ra_string = str(coords.ra.value)
-        dec_string = str(coords.dec.value)
-        matchstring = r"{}_{}*_{}*_{}_astrocut.fits".format(sector_name,
-                                                            ra_string[:ra_string.find('.')+4],
-                                                            dec_string[:dec_string.find('.')+4],
-                                                            size_str)
-        cached_files = glob.glob(os.path.join(tesscut_dir, matchstring))
+        ra_string = _truncate_coordinate(str(coords.ra.value))
+        dec_string = _truncate_coordinate(str(coords.dec.value))
+        index_key = (sector_name, ra_string, dec_string, size_str)
+        path = _lookup_tesscut_index(tesscut_dir, index_key)
+        if path is None:
+            # fall back to scanning the directory if the index missed
+            matchstring = r"{}_{}*_{}*_{}_astrocut.fits".format(sector_name,
+                                                                ra_string,
+                                                                dec_string,
+                                                                size_str)
+            path = _scan_tesscut_dir(tesscut_dir, matchstring)
+            if path is not None:
+                _update_tesscut_index(tesscut_dir, index_key, path)
 
         # if any files exist, return the path to them instead of downloading
-        if len(cached_files) > 0:
-            path = cached_files[0]
+        if path is not None:
             log.debug("Cached file found.")
         # otherwise the file will be downloaded
         else:
-            cutout_path = TesscutClass().download_cutouts(coords, size=cutout_size,
-                                                          sector=sector, path=tesscut_dir)
-            path = os.path.join(download_dir, cutout_path[0][0])
+            with _tesscut_semaphore:
+                try:
+                    path = _download_tesscut_direct(coords, sector, cutout_size, tesscut_dir)
+                except (requests.exceptions.RequestException, SearchError,
+                        zipfile.BadZipFile) as exc:
+                    # Timeouts and server errors (e.g. "504 Gateway Timeout")
+                    # mean that TESSCut is overloaded, which a retry via
+                    # astroquery would only make worse.
+                    response = getattr(exc, 'response', None)
+                    if isinstance(exc, requests.exceptions.Timeout) or \
+                            (response is not None and response.status_code >= 500):
+                        raise
+                    log.debug("Direct TESSCut download failed ({}); "
+                              "retrying via astroquery.".format(exc))
+                    cutout_path = TesscutClass().download_cutouts(coords, size=cutout_size,
+                                                                  sector=sector, path=tesscut_dir)
+                    path = os.path.join(download_dir, cutout_path[0][0])
+            _update_tesscut_index(tesscut_dir, index_key, path)
             log.debug("Finished downloading.")
         return path
 
@@ -408,6 +586,11 @@ def search_targetpixelfile(target, radius=None, cadence='long',
             * A coordinate string in decimal format, e.g. "285.67942179 +50.24130576".
             * A coordinate string in sexagesimal format, e.g. "19:02:43.1 +50:14:28.7".
             * An `astropy.coordinates.SkyCoord` object.
+
+        A list of the above, or an array-valued `SkyCoord` object, can be
+        passed to search for several targets at once.  In this case the
+        search result will contain an ``input_target`` column which
+        identifies the target that yielded each data product.
     radius : float or `astropy.units.Quantity` object
         Conesearch radius.  If a float is given it will be assumed to be in
         units of arcseconds.  If `None` then we default to 0.0001 arcsec.
@@ -512,6 +695,11 @@ def search_lightcurve(target, radius=None, cadence='long',
             * A coordinate string in decimal format, e.g. "285.67942179 +50.24130576".
             * A coordinate string in sexagesimal format, e.g. "19:02:43.1 +50:14:28.7".
             * An `astropy.coordinates.SkyCoord` object.
+
+        A list of the above, or an array-valued `SkyCoord` object, can be
+        passed to search for several targets at once.  In this case the
+        search result will contain an ``input_target`` column which
+        identifies the target that yielded each data product.
     radius : float or `astropy.units.Quantity` object
         Conesearch radius.  If a float is given it will be assumed to be in
         units of arcseconds.  If `None` then we default to 0.0001 arcsec.
@@ -623,6 +811,21 @@ def search_tesscut(target, sector=None):
         return SearchResult(None)
 
 
+def clear_search_cache():
+    """Empties the in-memory cache of MAST search results.
+
+    The search functions cache the observations and TESSCut sectors returned
+    by MAST for the rest of the session, such that repeating a search does not
+    query MAST again.  Call this function to make the next search query MAST
+    anew, e.g. to find data which has been released since the previous search.
+
+    Downloaded files are cached on disk instead, and are not affected.
+    """
+    for cached_function in [_query_mast_cached, _query_mast_exact_names_cached,
+                            _resolve_object, _get_tesscut_sectors]:
+        cached_function.cache_clear()
+
+
 def _search_products(target, radius=None, filetype="Lightcurve", cadence='long',
                      mission=('Kepler', 'K2', 'TESS'),
                      provenance_name=('Kepler', 'K2', 'SPOC'),
@@ -634,7 +837,7 @@ def _search_products(target, radius=None, filetype="Lightcurve", cadence='long',
 
     Parameters
     ----------
-    target : str, int, or `astropy.coordinates.SkyCoord` object
+    target : str, int, `astropy.coordinates.SkyCoord` object, or list
         See docstrings above.
     radius : float or `astropy.units.Quantity` object
         Conesearch radius.  If a float is given it will be assumed to be in
@@ -664,15 +867,18 @@ def _search_products(target, radius=None, filetype="Lightcurve", cadence='long',
     -------
     SearchResult : :class:`SearchResult` object.
     """
-    if isinstance(target, int):
-        if (0 < target) and (target < 13161030):
-            log.warning("Warning: {} may refer to a different Kepler or TESS target. "
-                        "Please add the prefix 'KIC' or 'TIC' to disambiguate."
-                        "".format(target))
-        elif (0 < 200000000) and (target < 251813739):
-            log.warning("Warning: {} may refer to a different K2 or TESS target. "
-                        "Please add the prefix 'EPIC' or 'TIC' to disambiguate."
-                        "".format(target))
+    # A list of targets or an array-valued `SkyCoord` triggers a batch search,
+    # even if it contains a single target, such that the result always has an
+    # `input_target` column.  TESSCut searches support one target only.
+    targets = _parse_target_list(target)
+    if targets is not None and len(targets) == 1 and filetype.lower() == 'ffi':
+        target, targets = targets[0], None
+    if targets is None and isinstance(target, int):
+        _warn_ambiguous_target_ids(target)
+    elif targets is not None:
+        _warn_ambiguous_target_ids([t for t in targets if isinstance(t, (int, np.integer))])
+    if targets is not None and filetype.lower() == 'ffi':
+        raise SearchError('TESSCut searches support only one target at a time.')
 
     # Ensure mission is a list
     mission = np.atleast_1d(mission).tolist()
@@ -683,22 +889,34 @@ def _search_products(target, radius=None, filetype="Lightcurve", cadence='long',
     else:
         provenance_name = np.atleast_1d(provenance_name).tolist()
 
-    # Speed up by restricting the MAST query if we don't want FFI image data
-    extra_query_criteria = {}
+    # Speed up by restricting the MAST query to the type of data we want
+    extra_query_criteria = dict(extra_query_criteria)
     if filetype in ['Lightcurve', 'Target Pixel']:
         # At MAST, non-FFI Kepler pipeline products are known as "cube" products,
         # and non-FFI TESS pipeline products are listed as "timeseries".
         extra_query_criteria['dataproduct_type'] = ['cube', 'timeseries']
+    elif filetype.lower() == 'ffi':
+        # TESS FFIs are listed as "image" products of the TESS collection
+        extra_query_criteria['dataproduct_type'] = ['image']
+        extra_query_criteria['obs_collection'] = 'TESS'
     # Make sure `search_tesscut` always performs a cone search (i.e. always
     # passed a radius value), because strict target name search does not apply.
     if filetype.lower() == 'ffi' and radius is None:
         radius = .0001 * u.arcsec
-    observations = _query_mast(target, radius=radius,
-                               project=mission,
-                               provenance_name=provenance_name,
-                               t_exptime=t_exptime,
-                               sequence_number=campaign or sector,
-                               **extra_query_criteria)
+    query_mast = _query_mast if targets is None else _query_mast_targets
+    # Empty query results are reported below, so astroquery's warning is
+    # silenced.  This is done here, rather than around each query, because
+    # `catch_warnings` is not thread-safe and batch queries run in threads.
+    _, _, NoResultsWarning = _get_mast()
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", category=NoResultsWarning)
+        observations = query_mast(target if targets is None else targets,
+                                  radius=radius,
+                                  project=mission,
+                                  provenance_name=provenance_name,
+                                  t_exptime=t_exptime,
+                                  sequence_number=campaign or sector,
+                                  **extra_query_criteria)
     log.debug("MAST found {} observations. "
               "Now querying MAST for the corresponding data products."
               "".format(len(observations)))
@@ -707,72 +925,292 @@ def _search_products(target, radius=None, filetype="Lightcurve", cadence='long',
 
     # Light curves and target pixel files
     if filetype.lower() != 'ffi':
-        from astroquery.mast import Observations
-        products = Observations.get_product_list(observations)
-        result = join(observations, products, keys="obs_id", join_type='right',
-                      uniq_col_name='{col_name}{table_name}', table_names=['', '_products'])
-        result.sort(['distance', 'obs_id'])
-
-        # Add the user-friendly 'author' column (synonym for 'provenance_name')
-        result['author'] = result['provenance_name']
-        # Add the user-friendly 'observation' column
-        result['observation'] = None
-        obs_prefix = {'Kepler': 'Quarter', 'K2': 'Campaign', 'TESS': 'Sector'}
-        for idx in range(len(result)):
-            obs_project = result['project'][idx]
-            obs_seqno = result['sequence_number'][idx]
-            # Kepler sequence_number values were not populated at the time of
-            # writing this code, so we parse them from the description field.
-            if obs_project == 'Kepler' and result['sequence_number'].mask[idx]:
-                try:
-                    obs_seqno = re.findall(r".*Q(\d+)", result['description'][idx])[0]
-                except IndexError:
-                    obs_seqno = ""
-            result['observation'][idx] = "{} {} {}".format(obs_project,
-                                                           obs_prefix.get(obs_project, ""),
-                                                           obs_seqno)
-
-        masked_result = _filter_products(result, filetype=filetype,
-                                         campaign=campaign, quarter=quarter,
-                                         cadence=cadence, project=mission,
-                                         provenance_name=provenance_name,
-                                         month=month, sector=sector, limit=limit)
+        masked_result = _query_products(observations, filetype=filetype,
+                                        campaign=campaign, quarter=quarter,
+                                        cadence=cadence, project=mission,
+                                        provenance_name=provenance_name,
+                                        month=month, sector=sector)
+        if limit is not None:
+            masked_result = masked_result[0:limit]
         log.debug("MAST found {} matching data products.".format(len(masked_result)))
         masked_result['distance'].info.format = '.1f'  # display <0.1 arcsec
         return SearchResult(masked_result)
 
     # Full Frame Images
     else:
-        cutouts = []
-        for idx in np.where(['TESS FFI' in t for t in observations['target_name']])[0]:
-            # if target passed in is a SkyCoord object, convert to RA, dec pair
-            if isinstance(target, SkyCoord):
-                target = '{}, {}'.format(target.ra.deg, target.dec.deg)
-            # pull sector numbers
-            s = observations['sequence_number'][idx]
-            # if the desired sector is available, add a row
-            if s in np.atleast_1d(sector) or sector is None:
-                cutouts.append({'description': f'TESS FFI Cutout (sector {s})',
-                                'observation': f'TESS Sector {s}',
-                                'target_name': str(target),
-                                'targetid': str(target),
-                                'productFilename': 'TESSCut',
-                                'provenance_name': 'MAST',
-                                'author': 'MAST',
-                                'distance': 0.0,
-                                'sequence_number': s,
-                                'project': 'TESS',
-                                'obs_collection': 'TESS'}
-                               )
-        if len(cutouts) > 0:
-            log.debug("Found {} matching cutouts.".format(len(cutouts)))
-            masked_result = Table(cutouts)
+        # if target passed in is a SkyCoord object, convert to RA, dec pair
+        if isinstance(target, SkyCoord):
+            ra, dec = _coords_to_radec(target)
+            target = '{}, {}'.format(ra[0], dec[0])
+        # select the FFI observations of the desired sectors, if available
+        names = np.asarray(observations['target_name']).astype(str)
+        mask = np.char.find(names, 'TESS FFI') >= 0
+        if sector is not None:
+            mask &= np.isin(np.asarray(observations['sequence_number']),
+                            np.atleast_1d(sector))
+        sectors = np.asarray(observations['sequence_number'][mask])
+        n_cutouts = len(sectors)
+        if n_cutouts > 0:
+            log.debug("Found {} matching cutouts.".format(n_cutouts))
+            masked_result = Table({
+                'description': np.char.mod('TESS FFI Cutout (sector %d)', sectors),
+                'observation': np.char.mod('TESS Sector %d', sectors),
+                'target_name': np.full(n_cutouts, str(target)),
+                'targetid': np.full(n_cutouts, str(target)),
+                'productFilename': np.full(n_cutouts, 'TESSCut'),
+                'provenance_name': np.full(n_cutouts, 'MAST'),
+                'author': np.full(n_cutouts, 'MAST'),
+                'distance': np.zeros(n_cutouts),
+                'sequence_number': sectors,
+                'project': np.full(n_cutouts, 'TESS'),
+                'obs_collection': np.full(n_cutouts, 'TESS')})
             masked_result.sort(['distance', 'sequence_number'])
         else:
             masked_result = None
         return SearchResult(masked_result)
 
 
+def _query_products(observations, **filter_kwargs):
+    """Helper function which queries MAST for the data products of a table of
+    observations and returns those which pass `_filter_products`.
+
+    The products of at most `PRODUCT_LIST_CHUNK_SIZE` observations are
+    requested at a time.  The requests are sent in parallel and the products
+    of each chunk are joined and filtered as soon as they arrive, which keeps
+    the tables small and overlaps the local work with the network requests.
+    """
+    # Nearby targets may share observations; request each one once
+    obsids = np.unique(observations['obsid'])
+    n_chunks = max(1, int(np.ceil(len(obsids) / PRODUCT_LIST_CHUNK_SIZE)))
+    chunks = np.array_split(obsids, n_chunks)
+
+    def query_chunk(chunk):
+        if n_chunks == 1:
+            chunk_observations = observations
+        else:
+            chunk_observations = observations[np.isin(observations['obsid'], chunk)]
+        # Look up `Observations` in the worker itself, because each thread
+        # needs an instance of its own (see `_get_mast`)
+        Observations, _, _ = _get_mast()
+        products = Observations.get_product_list(chunk.tolist())
+        result = _join_observations_products(chunk_observations, products)
+        # Add the user-friendly 'author' column (synonym for 'provenance_name')
+        result['author'] = result['provenance_name']
+        # Add the user-friendly 'observation' column
+        result['observation'] = _observation_names(result)
+        return _filter_products(result, **filter_kwargs)
+
+    if n_chunks == 1:
+        return query_chunk(chunks[0])
+    with ThreadPoolExecutor(max_workers=min(MAX_TCP_CONNECTIONS, n_chunks)) as executor:
+        results = list(executor.map(query_chunk, chunks))
+    masked_result = vstack(results, metadata_conflicts='silent')
+    masked_result.sort(['distance', 'productFilename'])
+    return masked_result
+
+
+def _observation_names(result):
+    """Returns an array of user-friendly observation names for the rows of a
+    products table, e.g. "Kepler Quarter 5" or "TESS Sector 14".
+    """
+    project = np.asarray(result['project']).astype(str)
+    prefix = np.select([project == 'Kepler', project == 'K2', project == 'TESS'],
+                       ['Quarter', 'Campaign', 'Sector'], default='')
+    seqno_mask = np.ma.getmaskarray(result['sequence_number'])
+    seqno = np.asarray(result['sequence_number']).astype(str).astype(object)
+    seqno[seqno_mask] = ''
+    # Kepler sequence_number values were not populated at the time of
+    # writing this code, so we parse them from the description field.
+    descriptions = result['description']
+    for idx in np.where(seqno_mask & (project == 'Kepler'))[0]:
+        match = _KPLR_Q_RE.match(descriptions[idx])
+        if match:
+            seqno[idx] = match.group(1)
+    return np.char.add(np.char.add(project, ' '),
+                       np.char.add(np.char.add(prefix, ' '), seqno.astype(str)))
+
+
+def _join_observations_products(observations, products):
+    """Returns a table which adds the observation metadata to each product.
+
+    This is equivalent to a right join of `observations` and `products` on
+    the ``obs_id`` column, in which conflicting product column names receive
+    a ``_products`` suffix.  Because ``obs_id`` is normally unique in the
+    observations table, we can avoid the cost of `astropy.table.join` by
+    looking up the observation row of each product and stacking the tables
+    side by side.  We fall back to `join` if ``obs_id`` is not unique or if
+    a product does not match any observation.
+    """
+    obs_ids = np.asarray(observations['obs_id'])
+    row_lookup = {obs_id: idx for idx, obs_id in enumerate(obs_ids)}
+    if len(row_lookup) == len(obs_ids):
+        obs_idx = np.fromiter((row_lookup.get(obs_id, -1)
+                               for obs_id in np.asarray(products['obs_id'])),
+                              dtype=int, count=len(products))
+        if np.all(obs_idx >= 0):
+            product_columns = [col for col in products.colnames if col != 'obs_id']
+            right = products[product_columns]
+            for col in product_columns:
+                if col in observations.colnames:
+                    right.rename_column(col, col + '_products')
+            return hstack([observations[obs_idx], right],
+                          join_type='exact', metadata_conflicts='silent')
+    return join(observations, products, keys="obs_id", join_type='right',
+                uniq_col_name='{col_name}{table_name}', table_names=['', '_products'])
+
+
+def _coords_to_radec(coords):
+    """Returns the right ascension and declination of a `SkyCoord` object
+    as two flat arrays in degrees.
+
+    The angles are converted for all positions at once.  Iterating over a
+    `SkyCoord` object is orders of magnitude slower and should be avoided.
+    """
+    return (np.atleast_1d(coords.ra.deg).ravel(),
+            np.atleast_1d(coords.dec.deg).ravel())
+
+
+def _parse_target_list(target):
+    """Returns a list of targets if `target` specifies more than one target,
+    i.e. if it is a list, tuple, array, or array-valued `SkyCoord`.
+    Returns `None` if `target` specifies a single target.
+    """
+    if isinstance(target, SkyCoord):
+        if target.isscalar:
+            return None
+        ra, dec = _coords_to_radec(target)
+        return ['{}, {}'.format(ra_i, dec_i) for ra_i, dec_i in zip(ra, dec)]
+    if isinstance(target, np.ndarray):
+        return target.ravel().tolist()
+    if isinstance(target, (list, tuple)):
+        return list(target)
+    return None
+
+
+def _query_mast_targets(targets, **kwargs):
+    """Helper function which queries MAST for each of several targets
+    and combines the results into a single table.
+
+    Targets given as exact Kepler, K2, or TESS identifiers are looked up
+    together in a single `target_name` query.  The remaining targets are
+    passed to `_query_mast` one by one, in parallel.  An `input_target`
+    column is added to identify the target which yielded each observation.
+    Targets which MAST fails to resolve are skipped with a warning.
+    """
+    results = [None] * len(targets)
+    if kwargs.get('radius') is None:
+        exact_names = [_exact_target_name(target) for target in targets]
+        if any(exact_names):
+            _query_mast_exact_names(exact_names, results, **kwargs)
+
+    def query_one(target):
+        try:
+            return _query_mast(target, **kwargs)
+        except SearchError as exc:
+            log.warning('Skipping target "{}": {}'.format(target, exc))
+
+    remaining = [idx for idx, obs in enumerate(results) if obs is None]
+    if len(remaining) > 0:
+        n_workers = max(1, min(MAX_TCP_CONNECTIONS, len(remaining)))
+        with ThreadPoolExecutor(max_workers=n_workers) as executor:
+            queried = executor.map(query_one, [targets[idx] for idx in remaining])
+            for idx, obs in zip(remaining, queried):
+                results[idx] = obs
+
+    tables = []
+    for target, obs in zip(targets, results):
+        if obs is not None and len(obs) > 0:
+            obs['input_target'] = str(target)
+            tables.append(obs)
+    if len(tables) == 0:
+        return Table()
+    return vstack(tables, metadata_conflicts='silent')
+
+
+def _query_mast_exact_names(exact_names, results, radius=None,
+                            project=('Kepler', 'K2', 'TESS'),
+                            provenance_name=("Kepler", "K2", "SPOC"),
+                            t_exptime=(0, 9999),
+                            sequence_number=None,
+                            **extra_query_criteria):
+    """Helper function which queries MAST for several exact target names at once.
+
+    `exact_names` contains the exact MAST `target_name` of each input target,
+    or `None` if the target is not an identifier.  The observations found for
+    each name are stored at the same position in `results`; positions for
+    which nothing was found are left unchanged.  Like `_query_mast`, the
+    responses from MAST are cached in memory.
+    """
+    unique_names = tuple(sorted(set(name for name in exact_names if name)))
+    extra_query_criteria = tuple(sorted((key, _to_hashable(value))
+                                        for key, value in extra_query_criteria.items()))
+    obs = _query_mast_exact_names_cached(unique_names,
+                                         project=_to_hashable(project),
+                                         provenance_name=_to_hashable(provenance_name),
+                                         t_exptime=_to_hashable(t_exptime),
+                                         sequence_number=_to_hashable(sequence_number),
+                                         extra_query_criteria=extra_query_criteria)
+    if len(obs) == 0:
+        return
+
+    # Sort the observations by name so that the rows of each target are
+    # contiguous.  Indexing with an array copies the rows, so the cached
+    # table is never exposed to the caller.
+    obs_names = np.char.lower(np.asarray(obs['target_name']).astype(str))
+    order = np.argsort(obs_names, kind='stable')
+    obs_names = obs_names[order]
+    query_names = [name or '' for name in exact_names]
+    starts = np.searchsorted(obs_names, query_names, side='left')
+    stops = np.searchsorted(obs_names, query_names, side='right')
+    for idx, (name, start, stop) in enumerate(zip(exact_names, starts, stops)):
+        if name and stop > start:
+            results[idx] = obs[order[start:stop]]
+
+
+@lru_cache(maxsize=256)
+def _query_mast_exact_names_cached(unique_names, project, provenance_name, t_exptime,
+                                   sequence_number, extra_query_criteria):
+    """Helper function which performs the query for `_query_mast_exact_names`.
+
+    All arguments must be hashable: `unique_names` is a sorted tuple of names
+    and `extra_query_criteria` is a tuple of (key, value) pairs.
+    """
+    Observations, _, _ = _get_mast()
+
+    query_criteria = _mast_query_criteria(project=project,
+                                          provenance_name=provenance_name,
+                                          t_exptime=t_exptime,
+                                          sequence_number=sequence_number,
+                                          **dict(extra_query_criteria))
+    log.debug("Started querying MAST for observations of {} exact "
+              "target names.".format(len(unique_names)))
+    obs = Observations.query_criteria(target_name=list(unique_names), **query_criteria)
+    if len(obs) > 0:
+        # astroquery does not report distance when querying by `target_name`
+        obs['distance'] = 0.
+    return obs
+
+
+# Integer target identifiers which fall within these ranges are valid KIC or
+# EPIC identifiers as well as TIC identifiers.  The edges are laid out such
+# that `np.searchsorted(..., side='right')` returns 1 for ambiguous KIC ranges
+# and 3 for ambiguous EPIC ranges.
+_AMBIGUOUS_ID_EDGES = np.array([1, 13161030, 200000001, 251813739])
+_AMBIGUOUS_ID_MISSIONS = {1: ('Kepler', 'KIC'), 3: ('K2', 'EPIC')}
+
+
+def _warn_ambiguous_target_ids(targets):
+    """Warns if one or more integer target ids may refer to multiple missions."""
+    targets = np.atleast_1d(targets)
+    range_idx = np.searchsorted(_AMBIGUOUS_ID_EDGES, targets, side='right')
+    for target, idx in zip(targets, range_idx):
+        if idx in _AMBIGUOUS_ID_MISSIONS:
+            mission, prefix = _AMBIGUOUS_ID_MISSIONS[idx]
+            log.warning("Warning: {} may refer to a different {} or TESS target. "
+                        "Please add the prefix '{}' or 'TIC' to disambiguate."
+                        "".format(target, mission, prefix))
+
+
 def _query_mast(target, radius=None,
                 project=('Kepler', 'K2', 'TESS'),
                 provenance_name=("Kepler", "K2", "SPOC"),
@@ -811,53 +1249,68 @@ def _query_mast(target, radius=None,
     -------
     obs : astropy.Table
         Table detailing the available observations on MAST.
-    """
-    # Local astroquery import because the package is not used elsewhere
-    from astroquery.mast import Observations
-    from astroquery.exceptions import ResolverError, NoResultsWarning
 
+    Notes
+    -----
+    The responses from MAST are cached in memory, such that repeating a
+    search does not query MAST again.  A copy of the cached table is
+    returned, which may be modified freely.  The cache can be emptied using
+    `clear_search_cache`.
+    """
     # If passed a SkyCoord, convert it to an "ra, dec" string for MAST
     if isinstance(target, SkyCoord):
-        target = '{}, {}'.format(target.ra.deg, target.dec.deg)
+        ra, dec = _coords_to_radec(target)
+        target = '{}, {}'.format(ra[0], dec[0])
+    if radius is not None and isinstance(radius, u.quantity.Quantity):
+        radius = radius.to(u.arcsec).value
+
+    # The arguments are converted into hashable values to serve as cache key
+    extra_query_criteria = tuple(sorted((key, _to_hashable(value))
+                                        for key, value in extra_query_criteria.items()))
+    obs = _query_mast_cached(target, radius=radius,
+                             project=_to_hashable(project),
+                             provenance_name=_to_hashable(provenance_name),
+                             t_exptime=_to_hashable(t_exptime),
+                             sequence_number=_to_hashable(sequence_number),
+                             extra_query_criteria=extra_query_criteria)
+    return obs.copy()
+
+
+def _to_hashable(value):
+    """Converts a list or array into a tuple, such that it can be used as a cache key."""
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(np.ravel(value).tolist())
+    return value
+
+
+@lru_cache(maxsize=1024)
+def _query_mast_cached(target, radius, project, provenance_name, t_exptime,
+                       sequence_number, extra_query_criteria):
+    """Helper function which performs the queries for `_query_mast`.
+
+    All arguments must be hashable: `radius` is a float in arcseconds (or `None`)
+    and `extra_query_criteria` is a tuple of (key, value) pairs.
+    """
+    Observations, ResolverError, _ = _get_mast()
 
     # We pass the following `query_criteria` to MAST regardless of whether
     # we search by position or target name:
-    query_criteria = {
-        'project': project,
-        **extra_query_criteria
-        }
-    if provenance_name is not None:
-        query_criteria['provenance_name'] = provenance_name
-    if sequence_number is not None:
-        query_criteria['sequence_number'] = sequence_number
-    if t_exptime is not None:
-        query_criteria['t_exptime'] = t_exptime
+    query_criteria = _mast_query_criteria(project=project,
+                                          provenance_name=provenance_name,
+                                          t_exptime=t_exptime,
+                                          sequence_number=sequence_number,
+                                          **dict(extra_query_criteria))
 
     # If an exact KIC ID is passed, we will search by the exact `target_name`
     # under which MAST will know the object to prevent source confusion.
     # For discussion, see e.g. GitHub issues #148, #718.
-    exact_target_name = None
-    target_lower = str(target).lower()
-    # Was a Kepler target ID passed?
-    kplr_match = re.match("^(kplr|kic) ?(\d+)$", target_lower)
-    if kplr_match:
-        exact_target_name = f"kplr{kplr_match.group(2).zfill(9)}"
-    # Was a K2 target ID passed?
-    ktwo_match = re.match("^(ktwo|epic) ?(\d+)$", target_lower)
-    if ktwo_match:
-        exact_target_name = f"ktwo{ktwo_match.group(2).zfill(9)}"
-    # Was a TESS target ID passed?
-    tess_match = re.match("^(tess|tic) ?(\d+)$", target_lower)
-    if tess_match:
-        exact_target_name = f"{tess_match.group(2).zfill(9)}"
+    exact_target_name = _exact_target_name(target)
 
     if exact_target_name and radius is None:
         log.debug("Started querying MAST for observations with the exact "
                   f"target_name='{exact_target_name}'.")
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=NoResultsWarning)
-            obs = Observations.query_criteria(target_name=exact_target_name,
-                                              **query_criteria)
+        obs = Observations.query_criteria(target_name=exact_target_name,
+                                          **query_criteria)
         if len(obs) > 0:
             # astroquery does not report distance when querying by `target_name`;
             # we add it here so that the table returned always has this column.
@@ -870,17 +1323,15 @@ def _query_mast(target, radius=None,
     # `radius` defaults to 0.0001 and unit arcsecond
     if radius is None:
         radius = .0001 * u.arcsec
-    elif not isinstance(radius, u.quantity.Quantity):
+    else:
         radius = radius * u.arcsec
     query_criteria['radius'] = str(radius.to(u.deg))
 
     try:
         log.debug("Started querying MAST for observations within "
                   f"{radius.to(u.arcsec)} arcsec of objectname='{target}'.")
-        with warnings.catch_warnings():
-            warnings.filterwarnings("ignore", category=NoResultsWarning)
-            obs = Observations.query_criteria(objectname=target,
-                                              **query_criteria)
+        obs = Observations.query_criteria(objectname=target,
+                                          **query_criteria)
         obs.sort('distance')
         return obs
     except ResolverError as exc:
@@ -888,6 +1339,33 @@ def _query_mast(target, radius=None,
         raise SearchError(exc) from exc
 
 
+def _mast_query_criteria(project, provenance_name, t_exptime, sequence_number,
+                         **extra_query_criteria):
+    """Returns the `query_criteria` passed to MAST for every observation query."""
+    query_criteria = {
+        'project': project,
+        **extra_query_criteria
+        }
+    if provenance_name is not None:
+        query_criteria['provenance_name'] = provenance_name
+    if sequence_number is not None:
+        query_criteria['sequence_number'] = sequence_number
+    if t_exptime is not None:
+        query_criteria['t_exptime'] = t_exptime
+    return query_criteria
+
+
+def _exact_target_name(target):
+    """Returns the exact MAST `target_name` of a Kepler, K2, or TESS identifier.
+
+    Returns `None` if `target` is not recognized as such an identifier.
+    """
+    match = _ID_RE.match(str(target).lower())
+    if match is None:
+        return None
+    return _ID_FORMATS[match.group(1)].format(int(match.group(2)))
+
+
 def _filter_products(products, campaign=None, quarter=None, month=None,
                      sector=None, cadence='long', limit=None,
                      project=('Kepler', 'K2', 'TESS'),
@@ -921,29 +1399,54 @@ def _filter_products(products, campaign=None, quarter=None, month=None,
     else:
         provenance_lower = [p.lower() for p in np.atleast_1d(provenance_name)]
 
-    mask = np.ones(len(products), dtype=bool)
-
-    # Kepler data needs a special filter for quarter, month, and file type
-    mask &= ~np.array([prov.lower() == 'kepler' for prov in products['provenance_name']])
-    if 'kepler' in provenance_lower and campaign is None and sector is None:
-        mask |= _mask_kepler_products(products, quarter=quarter, month=month,
-                                      cadence=cadence, filetype=filetype)
+    # Split the products by provenance once; each mission-specific mask below
+    # is only evaluated on the rows of its own mission.
+    prov_lower = np.char.lower(np.asarray(products['provenance_name']).astype(str))
+    is_kepler = prov_lower == 'kepler'
+    is_k2 = prov_lower == 'k2'
+    is_spoc = prov_lower == 'spoc'
+    mask = ~(is_kepler | is_k2 | is_spoc)
+
+    if campaign is None and quarter is None and month is None and sector is None:
+        # Without quarter, month, campaign, or sector criteria, the mission
+        # filters reduce to matching the file type and cadence in the product
+        # descriptions, which is done in a single pass over the table.
+        description = np.asarray(products['description']).astype(str)
+        is_selected = np.zeros(len(products), dtype=bool)
+        if 'kepler' in provenance_lower:
+            is_selected |= is_kepler
+        if 'k2' in provenance_lower:
+            is_selected |= is_k2
+        if is_selected.any():
+            description_string = _kepler_description_string(cadence, filetype)
+            mask |= is_selected & (np.char.find(description, description_string) >= 0)
+        if 'spoc' in provenance_lower and is_spoc.any():
+            description_string = _spoc_description_string(filetype)
+            mask |= is_spoc & (np.char.find(description, description_string) >= 0)
 
-    # K2 data needs a special filter for file type
-    mask &= ~np.array([prov.lower() == 'k2' for prov in products['provenance_name']])
-    if 'k2' in provenance_lower and quarter is None and sector is None:
-        mask |= _mask_k2_products(products, campaign=campaign,
-                                  cadence=cadence, filetype=filetype)
-
-    # TESS SPOC data needs a special filter for file type
-    mask &= ~np.array([prov.lower() == 'spoc' for prov in products['provenance_name']])
-    if 'spoc' in provenance_lower and quarter is None and campaign is None:
-        mask |= _mask_spoc_products(products, sector=sector, filetype=filetype)
+    else:
+        # Kepler data needs a special filter for quarter, month, and file type
+        if ('kepler' in provenance_lower and campaign is None and sector is None
+                and is_kepler.any()):
+            mask[is_kepler] = _mask_kepler_products(
+                products[['description', 'dataURI']][is_kepler], quarter=quarter,
+                month=month, cadence=cadence, filetype=filetype)
+
+        # K2 data needs a special filter for file type
+        if 'k2' in provenance_lower and quarter is None and sector is None and is_k2.any():
+            mask[is_k2] = _mask_k2_products(products[['description']][is_k2],
+                                            campaign=campaign, cadence=cadence,
+                                            filetype=filetype)
+
+        # TESS SPOC data needs a special filter for file type
+        if ('spoc' in provenance_lower and quarter is None and campaign is None
+                and is_spoc.any()):
+            mask[is_spoc] = _mask_spoc_products(products[['description']][is_spoc],
+                                                sector=sector, filetype=filetype)
 
     # Allow only fits files
-    mask &= np.array([uri.lower().endswith('fits') or
-                      uri.lower().endswith('fits.gz')
-                      for uri in products['productFilename']])
+    uri_lower = np.char.lower(np.asarray(products['productFilename']).astype(str))
+    mask &= np.char.endswith(uri_lower, 'fits') | np.char.endswith(uri_lower, 'fits.gz')
 
     products = products[mask]
 
@@ -953,99 +1456,356 @@ def _filter_products(products, campaign=None, quarter=None, month=None,
     return products
 
 
+@lru_cache(maxsize=None)
+def _load_short_cadence_start_times():
+    """Returns a dictionary which maps the Kepler (quarter, month) pairs onto
+    the start time which appears in the names of short cadence files.
+
+    The lookup table is read from disk only once.
+    """
+    table = ascii.read(os.path.join(PACKAGEDIR, 'data', 'short_cadence_month_lookup.csv'))
+    # The start times are converted to strings explicitly, because on systems
+    # where the default integer type is int32 (e.g. Windows/Appveyor) the
+    # column is interpreted as string rather than as integer.
+    return {(int(quarter), int(month)): str(start_time)
+            for quarter, month, start_time
+            in zip(table['Quarter'], table['Month'], table['StartTime'])}
+
+
 def _mask_kepler_products(products, quarter=None, month=None, cadence='long',
                           filetype='Target Pixel'):
-    """Returns a mask flagging the Kepler products that match the criteria."""
-    mask = np.array([proj.lower() == 'kepler' for proj in products['provenance_name']])
-    if mask.sum() == 0:
-        return mask
+    """Returns a mask flagging which of the given Kepler products match the criteria."""
+    mask = np.ones(len(products), dtype=bool)
 
     # Filters on cadence and product type
-    if cadence in ['short', 'sc']:
-        description_string = "{} Short".format(filetype)
-    elif cadence in ['any', 'both']:
-        description_string = "{}".format(filetype)
-    else:
-        description_string = "{} Long".format(filetype)
-    mask &= np.array([description_string in desc for desc in products['description']])
+    description_string = _kepler_description_string(cadence, filetype)
+    description = np.asarray(products['description']).astype(str)
+    mask &= np.char.find(description, description_string) >= 0
 
     # Identify quarter by the description.
     # This is necessary because the `sequence_number` field was not populated
     # for Kepler prime data at the time of writing this function.
     if quarter is not None:
-        quarter_mask = np.zeros(len(products), dtype=bool)
-        for q in np.atleast_1d(quarter):
-            quarter_mask |= np.array([desc.lower().replace('-', '').endswith('q{}'.format(q))
-                                      for desc in products['description']])
-        mask &= quarter_mask
+        # Parse the quarter of each product once, rather than once per quarter
+        stripped = np.char.replace(np.char.lower(description), '-', '')
+        matches = [_KPLR_QEND_RE.search(desc) for desc in stripped]
+        product_quarters = np.array([int(m.group(1)) if m else -1 for m in matches])
+        mask &= np.isin(product_quarters, np.atleast_1d(quarter).astype(int))
 
     # For Kepler short cadence data the month can be specified
     if month is not None:
         month = np.atleast_1d(month)
         # Get the short cadence date lookup table.
-        table = ascii.read(os.path.join(PACKAGEDIR, 'data', 'short_cadence_month_lookup.csv'))
-        # The following line is needed for systems where the default integer type
-        # is int32 (e.g. Windows/Appveyor), the column will then be interpreted
-        # as string which makes the test fail.
-        table['StartTime'] = table['StartTime'].astype(str)
+        start_times = _load_short_cadence_start_times()
         # Grab the dates of each of the short cadence files.
         # Make sure every entry has the correct month
-        is_shortcadence = mask & np.asarray(['Short' in desc for desc in products['description']])
-        for idx in np.where(is_shortcadence)[0]:
-            quarter = int(products['description'][idx].split(' - ')[-1][1:].replace('-', ''))
-            date = products['dataURI'][idx].split('/')[-1].split('-')[1].split('_')[0]
-            permitted_dates = []
-            for m in month:
-                try:
-                    permitted_dates.append(table['StartTime'][
-                        np.where((table['Month'] == m) & (table['Quarter'] == quarter))[0][0]
-                                    ])
-                except IndexError:
-                    pass
-            if not (date in permitted_dates):
-                mask[idx] = False
+        is_shortcadence = mask & (np.char.find(description, 'Short') >= 0)
+        if is_shortcadence.any():
+            # The quarter is the suffix of the description, e.g. "... - Q11"
+            quarters = np.char.rpartition(description[is_shortcadence], ' - ')[:, 2]
+            quarters = np.char.replace(np.char.lstrip(quarters, 'Q'), '-', '').astype(int)
+            # The date is the second field of the file name, e.g. "kplr...-2011303113607_slc"
+            filenames = np.char.rpartition(
+                np.asarray(products['dataURI'][is_shortcadence]).astype(str), '/')[:, 2]
+            dates = np.char.partition(np.char.partition(filenames, '-')[:, 2], '-')[:, 0]
+            dates = np.char.partition(dates, '_')[:, 0]
+            # Keep the files whose (quarter, date) pair is one of the requested months
+            month = set(int(m) for m in month)
+            permitted = ['{}:{}'.format(q, start_time)
+                         for (q, m), start_time in start_times.items() if m in month]
+            keys = np.char.add(np.char.add(quarters.astype(str), ':'), dates)
+            mask[is_shortcadence] &= np.isin(keys, permitted)
 
     return mask
 
 
 def _mask_k2_products(products, campaign=None, cadence='long', filetype='Target Pixel'):
-    """Returns a mask flagging the K2 products that match the criteria."""
-    mask = np.array([prov.lower() == 'k2' for prov in products['provenance_name']])
-    if mask.sum() == 0:
-        return mask
+    """Returns a mask flagging which of the given K2 products match the criteria."""
+    mask = np.ones(len(products), dtype=bool)
 
     # Filters on cadence and product type
-    if cadence in ['short', 'sc']:
-        description_string = "{} Short".format(filetype)
-    elif cadence in ['any', 'both']:
-        description_string = "{}".format(filetype)
-    else:
-        description_string = "{} Long".format(filetype)
-    mask &= np.array([description_string in desc for desc in products['description']])
+    description_string = _kepler_description_string(cadence, filetype)
+    description = np.asarray(products['description']).astype(str)
+    mask &= np.char.find(description, description_string) >= 0
 
     return mask
 
 
 def _mask_spoc_products(products, sector=None, filetype='Target Pixel'):
-    """Returns a mask flagging the TESS products that match the criteria."""
-    mask = np.array([p.lower() == 'spoc' for p in products['provenance_name']])
-    if mask.sum() == 0:
-        return mask
+    """Returns a mask flagging which of the given TESS SPOC products match the criteria."""
+    mask = np.ones(len(products), dtype=bool)
 
     # Filter on product type
+    description_string = _spoc_description_string(filetype)
+    description = np.asarray(products['description']).astype(str)
+    mask &= np.char.find(description, description_string) >= 0
+
+    return mask
+
+
+def _kepler_description_string(cadence, filetype):
+    """Returns the text which identifies the Kepler or K2 products of the given
+    cadence and file type in their MAST description."""
+    if cadence in ['short', 'sc']:
+        return "{} Short".format(filetype)
+    elif cadence in ['any', 'both']:
+        return "{}".format(filetype)
+    return "{} Long".format(filetype)
+
+
+def _spoc_description_string(filetype):
+    """Returns the text which identifies the TESS SPOC products of the given
+    file type in their MAST description."""
     if filetype.lower() == 'lightcurve':
-        description_string = 'Light curves'
+        return 'Light curves'
     elif filetype.lower() == 'target pixel':
-        description_string = 'Target pixel files'
+        return 'Target pixel files'
     elif filetype.lower() == 'ffi':
-        description_string = 'TESScut'
-    mask &= np.array([description_string in desc for desc in products['description']])
-
-    return mask
+        return 'TESScut'
+    raise ValueError("filetype must be 'Lightcurve', 'Target Pixel', or 'FFI'.")
+
+
+# astroquery is imported lazily, on first use, because it is slow to import
+# and only needed when data is searched for or downloaded.  The imported
+# classes are cached at module level so that worker threads do not contend
+# for the import lock on each download.
+_mast = None
+_mast_local = threading.local()
+_TesscutClass = None
+
+
+def _get_mast():
+    """Returns astroquery's `Observations` object along with the `ResolverError`
+    and `NoResultsWarning` classes needed to handle the outcome of its queries,
+    importing them on first use.
+
+    astroquery's query objects store the state of the request in progress, so
+    they must not be shared between threads.  Threads other than the main
+    thread therefore receive an `ObservationsClass` instance of their own,
+    which shares the HTTP session and authentication of the global
+    `Observations` object, such that `Observations.login()` applies to all
+    threads.
+    """
+    global _mast
+    if _mast is None:
+        from astroquery.mast import Observations, ObservationsClass
+        from astroquery.mast.discovery_portal import PortalAPI
+        from astroquery.mast.services import ServiceAPI
+        from astroquery.exceptions import ResolverError, NoResultsWarning
+        _mast = (Observations, ObservationsClass, PortalAPI, ServiceAPI,
+                 ResolverError, NoResultsWarning)
+    Observations, ObservationsClass, PortalAPI, ServiceAPI, ResolverError, NoResultsWarning = _mast
+    if threading.current_thread() is not threading.main_thread():
+        instance = getattr(_mast_local, 'observations', None)
+        if instance is None or instance._session is not Observations._session:
+            # The API connection objects hold the per-request state, so they
+            # are created anew around the session of the global object.
+            instance = ObservationsClass()
+            instance._session = Observations._session
+            instance._portal_api_connection = PortalAPI(Observations._session)
+            instance._service_api_connection = ServiceAPI(Observations._session)
+            _mast_local.observations = instance
+        # The login state may change at any time, so it is copied on each call
+        instance._auth_obj = Observations._auth_obj
+        instance._authenticated = Observations._authenticated
+        instance._cloud_connection = Observations._cloud_connection
+        Observations = instance
+    return Observations, ResolverError, NoResultsWarning
+
+
+def _get_tesscut_class():
+    """Returns astroquery's `TesscutClass`, importing it on first use."""
+    global _TesscutClass
+    if _TesscutClass is None:
+        from astroquery.mast import TesscutClass
+        _TesscutClass = TesscutClass
+    return _TesscutClass
 
 
+@lru_cache(maxsize=1024)
 def _resolve_object(target):
     """Ask MAST to resolve an object string to a set of coordinates."""
     from astroquery.mast import MastClass
     # Note: `_resolve_object` was renamed `resolve_object` in astroquery 0.3.10 (2019)
     return MastClass().resolve_object(target)
+
+
+@lru_cache(maxsize=256)
+def _get_tesscut_sectors(ra, dec):
+    """Ask TESSCut which sectors observed a given position (in degrees)."""
+    TesscutClass = _get_tesscut_class()
+    sectors = TesscutClass().get_sectors(coordinates=SkyCoord(ra, dec, unit='deg'))
+    # Index the table by sector number so that `sectors.loc[sector]` is fast
+    sectors.add_index('sector')
+    return sectors
+
+
+def _download_tesscut_direct(coords, sector, cutout_size, out_dir):
+    """Downloads a TESSCut cutout by requesting it from the TESSCut API directly.
+
+    This avoids the overhead of astroquery, which parses the request into
+    tables before and after the download.  The cutout is streamed to disk
+    in 1 MB chunks.
+
+    Parameters
+    ----------
+    coords : `astropy.coordinates.SkyCoord` object
+        Position of the center of the cutout.
+    sector : int
+        TESS Sector number.
+    cutout_size : int or tuple
+        Side length of the cutout in pixels.  Tuples should have dimensions (y, x).
+    out_dir : str
+        Directory in which the cutout will be stored.
+
+    Returns
+    -------
+    path : str
+        Path to the downloaded cutout file.
+    """
+    if isinstance(cutout_size, (tuple, list)):
+        ny, nx = int(cutout_size[0]), int(cutout_size[1])
+    else:
+        ny = nx = int(cutout_size)
+    params = {'ra': coords.ra.deg, 'dec': coords.dec.deg,
+              'y': ny, 'x': nx, 'units': 'px', 'sector': sector}
+    headers = {'User-Agent': 'lightkurve/{}'.format(__version__)}
+
+    # TESSCut returns the cutout inside a zip archive
+    fd, zip_path = tempfile.mkstemp(prefix='tesscut_', suffix='.zip', dir=out_dir)
+    try:
+        with os.fdopen(fd, 'wb') as out, \
+                requests.get(TESSCUT_URL, params=params, headers=headers,
+                             stream=True, timeout=600) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(chunk_size=1 << 20):
+                out.write(chunk)
+        if not zipfile.is_zipfile(zip_path):
+            # TESSCut returns a JSON message instead if there is no data
+            raise SearchError('TESSCut did not return a cutout for sector {}.'.format(sector))
+        with zipfile.ZipFile(zip_path) as archive:
+            filenames = archive.namelist()
+            archive.extractall(out_dir, members=filenames)
+    finally:
+        os.remove(zip_path)
+    if len(filenames) == 0:
+        raise SearchError('TESSCut returned an empty archive for sector {}.'.format(sector))
+    return os.path.join(out_dir, filenames[0])
+
+
+def _resolve_tesscut_target(target):
+    """Returns the coordinates of `target` and the table of TESSCut sectors
+    available at that position.  Both lookups are cached."""
+    coords = _resolve_object(str(target))
+    sectors = _get_tesscut_sectors(round(coords.ra.deg, 6), round(coords.dec.deg, 6))
+    return coords, sectors
+
+
+# The TESSCut cache index maps (sector_name, ra, dec, size) keys onto the
+# names of the cutout files in a `tesscut` cache directory, which avoids
+# scanning the directory each time a cutout is requested.
+_TESSCUT_INDEX_FILENAME = '_index.json'
+_TESSCUT_FILENAME_RE = re.compile(r"^(.+)_(-?[\d.]+)_(-?[\d.]+)_(\d+x\d+)_astrocut\.fits$")
+_tesscut_index = {}  # maps a tesscut directory onto its index
+_tesscut_index_lock = threading.Lock()
+
+
+def _truncate_coordinate(value):
+    """Truncates a decimal coordinate string to three decimals."""
+    return value[:value.find('.')+4]
+
+
+def _tesscut_index_key(key):
+    """Returns the string used to store an index key in the JSON file."""
+    return '|'.join(key)
+
+
+def _build_tesscut_index(tesscut_dir):
+    """Returns a new TESSCut cache index created by parsing the file names."""
+    index = {}
+    for fn in os.listdir(tesscut_dir):
+        match = _TESSCUT_FILENAME_RE.match(fn)
+        if match:
+            sector_name, ra, dec, size_str = match.groups()
+            key = (sector_name, _truncate_coordinate(ra),
+                   _truncate_coordinate(dec), size_str)
+            index.setdefault(_tesscut_index_key(key), fn)
+    return index
+
+
+def _write_tesscut_index(tesscut_dir, index):
+    """Atomically writes the TESSCut cache index to disk."""
+    path = os.path.join(tesscut_dir, _TESSCUT_INDEX_FILENAME)
+    tmp_path = '{}.{}.tmp'.format(path, threading.get_ident())
+    try:
+        with open(tmp_path, 'w') as out:
+            json.dump(index, out)
+        os.replace(tmp_path, path)
+    except OSError as exc:
+        log.debug("Unable to write the TESSCut cache index: {}".format(exc))
+
+
+def _scan_tesscut_dir(tesscut_dir, pattern):
+    """Returns the path of the first file in `tesscut_dir` which matches the
+    shell-style wildcard `pattern`, or `None`.
+
+    This is equivalent to `glob.glob` but iterates over the directory entries
+    once with a single precompiled regular expression.
+    """
+    regex = re.compile(fnmatch.translate(pattern))
+    try:
+        with os.scandir(tesscut_dir) as entries:
+            for entry in entries:
+                if regex.match(entry.name):
+                    return entry.path
+    except OSError:
+        pass
+    return None
+
+
+def _get_tesscut_index(tesscut_dir):
+    """Returns the TESSCut cache index for `tesscut_dir`, loading or creating
+    it on first use.  Returns `None` if the index is corrupt.
+
+    The caller must hold `_tesscut_index_lock`.
+    """
+    if tesscut_dir not in _tesscut_index:
+        path = os.path.join(tesscut_dir, _TESSCUT_INDEX_FILENAME)
+        if os.path.exists(path):
+            try:
+                with open(path) as fh:
+                    index = json.load(fh)
+                if not isinstance(index, dict):
+                    raise ValueError("index is not a dictionary")
+            except (OSError, ValueError) as exc:
+                log.debug("Ignoring corrupt TESSCut cache index: {}".format(exc))
+                index = None
+        else:
+            index = _build_tesscut_index(tesscut_dir)
+            _write_tesscut_index(tesscut_dir, index)
+        _tesscut_index[tesscut_dir] = index
+    return _tesscut_index[tesscut_dir]
+
+
+def _lookup_tesscut_index(tesscut_dir, key):
+    """Returns the path of a cached cutout matching `key`, or `None`."""
+    with _tesscut_index_lock:
+        index = _get_tesscut_index(tesscut_dir)
+        if index is None or _tesscut_index_key(key) not in index:
+            return None
+        path = os.path.join(tesscut_dir, index[_tesscut_index_key(key)])
+        if not os.path.exists(path):
+            # The file was removed from the cache since it was indexed
+            del index[_tesscut_index_key(key)]
+            return None
+        return path
+
+
+def _update_tesscut_index(tesscut_dir, key, path):
+    """Adds a newly cached cutout to the TESSCut cache index."""
+    with _tesscut_index_lock:
+        index = _get_tesscut_index(tesscut_dir)
+        if index is None:
+            return
+        index[_tesscut_index_key(key)] = os.path.basename(path)
+        _write_tesscut_index(tesscut_dir, index)
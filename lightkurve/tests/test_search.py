@@ -15,7 +15,7 @@ from requests import HTTPError
 
 from astropy.coordinates import SkyCoord
 import astropy.units as u
-from astropy.table import Table
+from astropy.table import Table, vstack
 
 from ..utils import LightkurveWarning, LightkurveError
 from ..search import search_lightcurve, search_targetpixelfile, \
@@ -229,6 +229,477 @@ def test_empty_searchresult():
         sr.download_all()
 
 
+def test_searchresult_index_column():
+    """The user-friendly `#` column should be a plain integer index."""
+    sr = SearchResult(Table({'target_name': ['a', 'b', 'c']}))
+    assert sr.table['#'].dtype == np.int64
+    assert_array_equal(sr.table['#'], [0, 1, 2])
+    assert_array_equal(sr[1:].table['#'], [0, 1])
+
+
+def test_searchresult_indexing():
+    """Indexing and iterating should yield one-row SearchResult objects."""
+    sr = SearchResult(Table({'target_name': ['a', 'b', 'c']}))
+    assert isinstance(sr[1], SearchResult)
+    assert sr[1].table['target_name'][0] == 'b'
+    # Issue #445: indexing with -1 should return the last row
+    assert sr[-1].table['target_name'][0] == 'c'
+    assert sr[np.int64(0)].table['target_name'][0] == 'a'
+    with pytest.raises(IndexError):
+        sr[3]
+    assert [r.table['target_name'][0] for r in sr] == ['a', 'b', 'c']
+    assert all(len(r) == 1 for r in sr)
+
+
+def test_searchresult_properties():
+    """The column properties should return plain numpy arrays."""
+    from astropy.table import MaskedColumn
+    for column_type in [np.array, MaskedColumn]:
+        table = Table({'target_name': column_type(['a', 'b']),
+                       's_ra': column_type([1., 2.]),
+                       's_dec': column_type([3., 4.])})
+        sr = SearchResult(table)
+        for attr, expected in [('target_name', ['a', 'b']),
+                               ('ra', [1., 2.]), ('dec', [3., 4.])]:
+            value = getattr(sr, attr)
+            assert type(value) is np.ndarray
+            assert_array_equal(value, expected)
+
+
+def test_join_observations_products():
+    """The fast join should match astropy's `join` of the same tables."""
+    from astropy.table import join
+    from ..search import _join_observations_products
+    observations = Table({'obs_id': ['b', 'a', 'c'],
+                          'obsid': [2, 1, 3],
+                          'distance': [0.5, 0., 1.]}, masked=True)
+    products = Table({'obs_id': ['a', 'b', 'a', 'c'],
+                      'obsid': [10, 20, 11, 30],
+                      'productFilename': ['a1.fits', 'b.fits', 'a2.fits', 'c.fits']})
+    for obs in [observations, vstack([observations, observations[:1]])]:
+        # The second case has a duplicate `obs_id` and uses the fallback path
+        expected = join(obs, products, keys="obs_id", join_type='right',
+                        uniq_col_name='{col_name}{table_name}', table_names=['', '_products'])
+        result = _join_observations_products(obs, products)
+        assert len(result) == len(expected)
+        assert result.colnames == expected.colnames
+        result.sort('productFilename')
+        expected.sort('productFilename')
+        for col in expected.colnames:
+            assert_array_equal(result[col], expected[col])
+
+
+def test_observation_names():
+    """Are the user-friendly observation names built correctly?"""
+    from astropy.table import MaskedColumn
+    from ..search import _observation_names
+    table = Table({'project': ['Kepler', 'Kepler', 'K2', 'TESS'],
+                   'sequence_number': MaskedColumn([0, 0, 5, 14],
+                                                   mask=[True, True, False, False]),
+                   'description': ['Lightcurve Long Cadence (CLC) - Q11',
+                                   'Unknown', 'Lightcurve Long', 'Light curves']})
+    assert_array_equal(_observation_names(table),
+                       ['Kepler Quarter 11', 'Kepler Quarter ',
+                        'K2 Campaign 5', 'TESS Sector 14'])
+
+
+def test_filter_products():
+    """Are quarters, months, campaigns, sectors and cadences filtered correctly?"""
+    from ..search import _filter_products
+    filenames = ['kplr011904151-2011177032512_llc.fits',  # Q10
+                 'kplr011904151-2012004120508_llc.fits',  # Q11
+                 'kplr011904151-2011303113607_slc.fits',  # Q11 month 1
+                 'kplr011904151-2011334093404_slc.fits',  # Q11 month 2
+                 'kplr011904151-2012004120508_slc.fits',  # Q11 month 3
+                 'kplr011904151-2012004120508_lpd-targ.fits.gz',
+                 'kplr011904151_dvr.pdf',
+                 'ktwo210634047-c04_llc.fits',
+                 'ktwo210634047-c04_slc.fits',
+                 'tess2018206045859-s0001-0000000261136679-0120-s_lc.fits',
+                 'hlsp_k2sff_k2_lightcurve_210634047-c04_kepler_v1_llc.fits']
+    products = Table({'provenance_name': ['Kepler'] * 7 + ['K2'] * 2 + ['SPOC', 'K2SFF'],
+                      'description': ['Lightcurve Long Cadence (CLC) - Q10',
+                                      'Lightcurve Long Cadence (CLC) - Q11']
+                                     + ['Lightcurve Short Cadence (CSC) - Q11'] * 3
+                                     + ['Target Pixel Long Cadence (TPL) - Q11',
+                                        'Data Validation Report',
+                                        'Lightcurve Long Cadence (KLC) - C04',
+                                        'Lightcurve Short Cadence (KSC) - C04',
+                                        'Light curves', 'K2SFF light curve'],
+                      'productFilename': filenames,
+                      'dataURI': ['mast:Kepler/url/' + fn for fn in filenames],
+                      'distance': np.zeros(len(filenames))})
+
+    def filtered(**kwargs):
+        kwargs.setdefault('filetype', 'Lightcurve')
+        return set(_filter_products(products.copy(), **kwargs)['productFilename'])
+
+    community = {filenames[-1]}
+    assert filtered(cadence='long') == set(filenames[i] for i in [0, 1, 7, 9]) | community
+    assert filtered(cadence='short', quarter=11) == set(filenames[2:5]) | community
+    assert filtered(cadence='short', quarter=11, month=[1, 3]) == \
+        {filenames[2], filenames[4]} | community
+    assert filtered(cadence='any', quarter=[10, 11]) == set(filenames[:5]) | community
+    assert filtered(cadence='any', campaign=4) == set(filenames[7:9]) | community
+    assert filtered(cadence='any', sector=1) == {filenames[9]} | community
+    assert filtered(cadence='any', provenance_name='kepler') == set(filenames[:5]) | community
+    assert filtered(cadence='long', filetype='Target Pixel') == {filenames[5]} | community
+    assert len(_filter_products(products.copy(), filetype='Lightcurve', limit=2)) == 2
+
+
+def test_parse_target_list():
+    """Lists and array-valued SkyCoords should be recognized as batch searches."""
+    from ..search import _parse_target_list
+    assert _parse_target_list('Kepler-10') is None
+    assert _parse_target_list(11904151) is None
+    assert _parse_target_list(SkyCoord(1, 2, unit='deg')) is None
+    assert _parse_target_list(['KIC 11904151', 210634047]) == ['KIC 11904151', 210634047]
+    assert _parse_target_list(np.array(['a', 'b'])) == ['a', 'b']
+    assert _parse_target_list(SkyCoord([1, 2], [3, 4], unit='deg')) == ['1.0, 3.0', '2.0, 4.0']
+
+
+def test_coords_to_radec():
+    """Scalar and array-valued SkyCoords should both yield flat arrays."""
+    from ..search import _coords_to_radec
+    ra, dec = _coords_to_radec(SkyCoord(1.5, 2, unit='deg'))
+    assert_array_equal(ra, [1.5])
+    assert_array_equal(dec, [2.])
+    ra, dec = _coords_to_radec(SkyCoord([[1, 2], [3, 4]], [[5, 6], [7, 8]], unit='deg'))
+    assert_array_equal(ra, [1, 2, 3, 4])
+    assert_array_equal(dec, [5, 6, 7, 8])
+
+
+def test_exact_target_name():
+    """Are target identifiers translated into the exact names known to MAST?"""
+    from ..search import _exact_target_name
+    assert _exact_target_name('KIC 11904151') == 'kplr011904151'
+    assert _exact_target_name('kplr11904151') == 'kplr011904151'
+    assert _exact_target_name('EPIC 210634047') == 'ktwo210634047'
+    assert _exact_target_name('TIC 261136679') == '261136679'
+    assert _exact_target_name('tic1234') == '000001234'
+    assert _exact_target_name('KIC 0011904151') == 'kplr011904151'
+    assert _exact_target_name('Kepler-10') is None
+    assert _exact_target_name(11904151) is None
+
+
+def test_get_mast_worker_thread_session(monkeypatch):
+    """Worker threads should get their own `Observations` object which keeps
+    the session and login token of the global one."""
+    import threading
+    import requests
+    from ..search import _get_mast
+    Observations, _, _ = _get_mast()
+    session = requests.Session()
+    session.cookies['mast_token'] = 'token'
+    monkeypatch.setattr(Observations, '_session', session)
+    monkeypatch.setattr(Observations, '_authenticated', True)
+    result = {}
+
+    def worker():
+        result['observations'] = _get_mast()[0]
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+    worker_observations = result['observations']
+    assert worker_observations is not Observations
+    assert worker_observations._session is session
+    assert worker_observations._session.cookies['mast_token'] == 'token'
+    assert worker_observations._auth_obj is Observations._auth_obj
+    assert worker_observations._authenticated
+    assert worker_observations._portal_api_connection is not Observations._portal_api_connection
+    assert worker_observations._portal_api_connection._session is session
+
+
+def _fake_query_criteria(self, target_name, **criteria):
+    """Stands in for `Observations.query_criteria`: every Kepler target name
+    has one observation in each of Quarters 10 and 11."""
+    from astropy.table import MaskedColumn
+    names = np.repeat(np.atleast_1d(target_name), 2)
+    kic = np.char.lstrip(np.char.lstrip(names.astype(str), 'kplr'), '0')
+    obs_ids = np.char.add(np.char.add(kic, '_q'), np.tile(['10', '11'], len(names) // 2))
+    return Table({'obs_id': obs_ids,
+                  'obsid': obs_ids,
+                  'target_name': names,
+                  'project': np.full(len(names), 'Kepler'),
+                  'provenance_name': np.full(len(names), 'Kepler'),
+                  'sequence_number': MaskedColumn(np.zeros(len(names), dtype=int),
+                                                  mask=np.ones(len(names), dtype=bool)),
+                  's_ra': np.ones(len(names)),
+                  's_dec': np.ones(len(names))}, masked=True)
+
+
+def _fake_get_product_list(self, obsids):
+    """Stands in for `Observations.get_product_list`: every observation has
+    a long cadence light curve and a data validation report."""
+    obsids = np.repeat(np.asarray(obsids, dtype=str), 2)
+    quarters = np.char.rpartition(obsids, '_q')[:, 2]
+    kic = np.char.rpartition(obsids, '_q')[:, 0]
+    lc = np.tile([True, False], len(obsids) // 2)
+    filenames = np.where(lc,
+                         np.char.add(np.char.add(np.char.add('kplr', kic), '-q'),
+                                     np.char.add(quarters, '_llc.fits')),
+                         np.char.add(np.char.add('kplr', kic), '_dvr.pdf'))
+    descriptions = np.where(lc,
+                            np.char.add('Lightcurve Long Cadence (CLC) - Q', quarters),
+                            'Data Validation Report')
+    return Table({'obs_id': obsids,
+                  'obsid': obsids,
+                  'description': descriptions,
+                  'productFilename': filenames,
+                  'dataURI': np.char.add('mast:Kepler/url/', filenames),
+                  'provenance_name': np.full(len(obsids), 'Kepler'),
+                  'project': np.full(len(obsids), 'Kepler')})
+
+
+@pytest.fixture
+def fake_mast(monkeypatch):
+    """Replaces the MAST queries made by the search functions with the fakes
+    above, in all threads, and removes the fake results from the cache."""
+    from astroquery.mast import ObservationsClass
+    from ..search import clear_search_cache
+    monkeypatch.setattr(ObservationsClass, 'query_criteria', _fake_query_criteria)
+    monkeypatch.setattr(ObservationsClass, 'get_product_list', _fake_get_product_list)
+    clear_search_cache()
+    yield
+    clear_search_cache()
+
+
+def test_search_single_target_list(fake_mast):
+    """A list containing a single target is a batch search, too."""
+    for targets in [['KIC 5112705'], np.array(['KIC 5112705'])]:
+        search = search_lightcurve(targets, quarter=11)
+        assert len(search) == 1
+        assert_array_equal(search.table['input_target'], ['KIC 5112705'])
+        assert_array_equal(search.table['productFilename'], ['kplr5112705-q11_llc.fits'])
+    search = search_lightcurve(['KIC 5112705', 'KIC 10058374'])
+    assert len(search) == 4
+    assert_array_equal(np.unique(search.table['input_target']), ['KIC 10058374', 'KIC 5112705'])
+    # A single target which is not passed as a list is not a batch search
+    assert 'input_target' not in search_lightcurve('KIC 5112705').table.colnames
+
+
+def test_search_multiple_targets_cache(fake_mast, monkeypatch):
+    """Batch searches should be cached until `clear_search_cache` is called."""
+    from astroquery.mast import ObservationsClass
+    from ..search import clear_search_cache
+    queries = []
+
+    def counting_query_criteria(self, **criteria):
+        queries.append(criteria)
+        return _fake_query_criteria(self, **criteria)
+    monkeypatch.setattr(ObservationsClass, 'query_criteria', counting_query_criteria)
+    targets = ['KIC 5112705', 'KIC 10058374']
+    search = search_lightcurve(targets)
+    search.table['input_target'][:] = 'modified'
+    assert len(queries) == 1
+    search = search_lightcurve(targets)
+    assert len(queries) == 1
+    assert_array_equal(np.unique(search.table['input_target']), sorted(targets))
+    clear_search_cache()
+    search_lightcurve(targets)
+    assert len(queries) == 2
+
+
+def test_query_products_chunks(fake_mast, monkeypatch):
+    """Requesting the products in several chunks should give the same result
+    as a single request."""
+    from .. import search
+    observations = _fake_query_criteria(None, ['kplr{:09d}'.format(kic)
+                                               for kic in range(1000, 1011)])
+    observations['distance'] = np.arange(len(observations)) % 3
+    # Observations shared by nearby targets are only requested once
+    observations = vstack([observations, observations[:2]])
+    expected = search._query_products(observations, filetype='Lightcurve', cadence='long')
+    monkeypatch.setattr(search, 'PRODUCT_LIST_CHUNK_SIZE', 4)
+    result = search._query_products(observations, filetype='Lightcurve', cadence='long')
+    assert len(result) == len(expected) == 24
+    assert result.colnames == expected.colnames
+    for col in expected.colnames:
+        assert_array_equal(result[col], expected[col])
+
+
+@pytest.mark.remote_data
+def test_search_multiple_targets():
+    """Can we search for several targets at once?"""
+    targets = ['KIC 5112705', 'KIC 10058374']
+    search = search_lightcurve(targets, quarter=11)
+    assert len(search) == 2
+    assert_array_equal(search.table['input_target'], targets)
+    # The same search using an array-valued SkyCoord
+    c = SkyCoord([297.5835, 297.5835], [40.98339, 40.98339], unit='deg')
+    assert len(search_targetpixelfile(c, quarter=6).table) == 2
+
+
+@pytest.mark.remote_data
+def test_query_mast_cache():
+    """Repeated queries should be served from the cache without sharing tables."""
+    from ..search import _query_mast, _query_mast_cached
+    obs = _query_mast('KIC 11904151', project='Kepler')
+    hits = _query_mast_cached.cache_info().hits
+    obs['foo'] = 1
+    obs2 = _query_mast('KIC 11904151', project='Kepler')
+    assert _query_mast_cached.cache_info().hits == hits + 1
+    assert 'foo' not in obs2.colnames
+    assert len(obs2) == len(obs)
+
+
+def test_unique_targets():
+    """`unique_targets` should keep the first row of each target, in order."""
+    table = Table({'target_name': ['b', 'a', 'b', 'c', 'a'],
+                   's_ra': [1., 2., 3., 4., 5.],
+                   's_dec': [6., 7., 8., 9., 10.]})
+    targets = SearchResult(table).unique_targets
+    assert targets.colnames == ['target_name', 's_ra', 's_dec']
+    assert_array_equal(targets['target_name'], ['b', 'a', 'c'])
+    assert_array_equal(targets['s_ra'], [1., 2., 4.])
+    assert_array_equal(targets['s_dec'], [6., 7., 9.])
+
+
+def test_ambiguous_target_ids(caplog):
+    """Integer ids which are both valid KIC/EPIC and TIC ids should warn."""
+    from ..search import _warn_ambiguous_target_ids
+    for target, prefix in [(11904151, "'KIC'"), (210634047, "'EPIC'")]:
+        caplog.clear()
+        _warn_ambiguous_target_ids(target)
+        assert prefix in caplog.text
+    # Ids outside the KIC and EPIC ranges are unambiguous (regression test
+    # for a bug which caused all ids above the KIC range to trigger a warning)
+    caplog.clear()
+    _warn_ambiguous_target_ids([0, 13161030, 150000000, 251813739, 261136679])
+    assert caplog.text == ""
+    # Lists of ids are checked in one go
+    _warn_ambiguous_target_ids([11904151, 210634047])
+    assert "'KIC'" in caplog.text and "'EPIC'" in caplog.text
+
+
+def test_tesscut_index():
+    """Can cached TESSCut files be found via the cache index?"""
+    from ..search import _lookup_tesscut_index, _update_tesscut_index, \
+                         _scan_tesscut_dir, _TESSCUT_INDEX_FILENAME
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        fn = "tess-s0001-4-1_30.578761_-83.210593_5x5_astrocut.fits"
+        open(os.path.join(tmpdirname, fn), 'w').close()
+        # The fallback directory scan supports glob-style patterns
+        pattern = "tess-s0001-4-1_30.578*_-83.210*_{}_astrocut.fits"
+        assert _scan_tesscut_dir(tmpdirname, pattern.format("5x5")) == os.path.join(tmpdirname, fn)
+        assert _scan_tesscut_dir(tmpdirname, pattern.format("3x3")) is None
+        # The index is created by parsing the names of the existing files
+        key = ("tess-s0001-4-1", "30.578", "-83.210", "5x5")
+        assert _lookup_tesscut_index(tmpdirname, key) == os.path.join(tmpdirname, fn)
+        assert os.path.exists(os.path.join(tmpdirname, _TESSCUT_INDEX_FILENAME))
+        assert _lookup_tesscut_index(tmpdirname, key[:3] + ("3x3",)) is None
+        # New files are added to the index
+        fn2 = "tess-s0001-4-1_30.578761_-83.210593_3x3_astrocut.fits"
+        open(os.path.join(tmpdirname, fn2), 'w').close()
+        _update_tesscut_index(tmpdirname, key[:3] + ("3x3",), fn2)
+        assert _lookup_tesscut_index(tmpdirname, key[:3] + ("3x3",)) == os.path.join(tmpdirname, fn2)
+        # Files removed from the cache are no longer returned
+        os.remove(os.path.join(tmpdirname, fn))
+        assert _lookup_tesscut_index(tmpdirname, key) is None
+
+
+class _FakeResponse:
+    """Stands in for the streamed `requests.Response` of a TESSCut request."""
+    def __init__(self, content, status_code=200):
+        self.content = content
+        self.status_code = status_code
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise HTTPError('{} Error'.format(self.status_code), response=self)
+
+    def iter_content(self, chunk_size):
+        for idx in range(0, len(self.content), chunk_size):
+            yield self.content[idx:idx + chunk_size]
+
+
+def _zip_bytes(files):
+    """Returns the bytes of a zip archive containing `files`."""
+    import io
+    import zipfile
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return buffer.getvalue()
+
+
+def test_download_tesscut_direct(monkeypatch):
+    """Are cutouts extracted from the archive returned by TESSCut?"""
+    import requests
+    from ..search import _download_tesscut_direct
+    coords = SkyCoord(30.578761, -83.210593, unit='deg')
+    fn = "tess-s0001-4-1_30.578761_-83.210593_3x5_astrocut.fits"
+    requests_made = []
+
+    def fake_get(content):
+        def get(url, params, **kwargs):
+            requests_made.append(params)
+            return _FakeResponse(content)
+        return get
+
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        monkeypatch.setattr(requests, 'get', fake_get(_zip_bytes({fn: b'cutout'})))
+        path = _download_tesscut_direct(coords, 1, (5, 3), tmpdirname)
+        assert path == os.path.join(tmpdirname, fn)
+        with open(path, 'rb') as f:
+            assert f.read() == b'cutout'
+        assert (requests_made[0]['y'], requests_made[0]['x']) == (5, 3)
+        assert requests_made[0]['sector'] == 1
+        # TESSCut returns a JSON message rather than a zip archive on error
+        monkeypatch.setattr(requests, 'get', fake_get(b'{"msg": "No data"}'))
+        with pytest.raises(SearchError, match='did not return a cutout'):
+            _download_tesscut_direct(coords, 1, 5, tmpdirname)
+        monkeypatch.setattr(requests, 'get', fake_get(_zip_bytes({})))
+        with pytest.raises(SearchError, match='empty archive'):
+            _download_tesscut_direct(coords, 1, 5, tmpdirname)
+        # The temporary zip files are always removed
+        assert os.listdir(tmpdirname) == [fn]
+
+
+def test_fetch_tesscut_path_fallback(monkeypatch):
+    """Failed direct TESSCut downloads should be retried via astroquery,
+    unless TESSCut is overloaded."""
+    import requests
+    from .. import search
+    coords = SkyCoord(30.578761, -83.210593, unit='deg')
+    sectors = Table({'sectorName': ['tess-s0001-4-1'], 'sector': [1]})
+    sectors.add_index('sector')
+    monkeypatch.setattr(search, '_resolve_tesscut_target', lambda target: (coords, sectors))
+    fn = "tess-s0001-4-1_30.578761_-83.210593_5x5_astrocut.fits"
+    errors = []
+
+    def fake_direct(coords, sector, cutout_size, out_dir):
+        raise errors[-1]
+
+    class FakeTesscut:
+        def download_cutouts(self, coordinates, size, sector, path):
+            return [[os.path.join(path, fn)]]
+
+    monkeypatch.setattr(search, '_download_tesscut_direct', fake_direct)
+    monkeypatch.setattr(search, '_get_tesscut_class', lambda: FakeTesscut)
+    for exc in [requests.exceptions.ConnectionError('refused'),
+                HTTPError('404 Client Error', response=_FakeResponse(b'', 404)),
+                SearchError('TESSCut did not return a cutout')]:
+        errors.append(exc)
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            path = SearchResult()._fetch_tesscut_path('target', 1, tmpdirname, 5)
+            assert path == os.path.join(tmpdirname, 'tesscut', fn)
+    # Timeouts and server errors are not retried
+    for exc in [requests.exceptions.ReadTimeout('timed out'),
+                HTTPError('504 Server Error', response=_FakeResponse(b'', 504))]:
+        errors.append(exc)
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            with pytest.raises(type(exc)):
+                SearchResult()._fetch_tesscut_path('target', 1, tmpdirname, 5)
+
+
 @pytest.mark.remote_data
 def test_issue_472():
     """Regression test for https://github.com/KeplerGO/lightkurve/issues/472"""
@@ -316,3 +787,13 @@ def test_download_flux_column():
     """Can we pass reader keyword arguments to the download method?"""
     lc = search_lightcurve("Pi Men", sector=12).download(flux_column='sap_flux')
     assert_array_equal(lc.flux, lc.sap_flux)
+
+
+@pytest.mark.remote_data
+def test_download_all_n_workers():
+    """Parallel downloads should return products in the order of the table."""
+    sr = search_lightcurve('Kepler-10', mission='Kepler', quarter=[1, 2, 3])
+    for n_workers in [1, 3, 100]:
+        lcc = sr.download_all(n_workers=n_workers)
+        assert len(lcc) == 3
+        assert [lc.quarter for lc in lcc] == [1, 2, 3]